@@ -1,21 +1,34 @@
 """Flask application entrypoint for the document translator prototype."""
 from __future__ import annotations
 
+import atexit
+import itertools
 import logging
 import json
+import os
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, Optional
-from uuid import uuid4
+from secrets import token_hex
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-from flask import Flask, abort, jsonify, request, send_from_directory, redirect
-from langdetect import detect, LangDetectException
+from flask import Flask, abort, current_app, g, jsonify, request, send_from_directory, redirect
+from flask.json.provider import DefaultJSONProvider
+from langdetect import DetectorFactory, LangDetectException, detect
 from werkzeug.exceptions import HTTPException
+from werkzeug.sansio.multipart import Data, Epilogue, Event, File, MultipartDecoder, NeedData
 from werkzeug.utils import secure_filename
 
+try:  # Optional speedup; Flask's stdlib-based provider is used without it.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
 from .config import settings
 from .document_handler import TextElement, TranslationOptions, get_document_handler
-from .translator import OpenRouterTranslator, TranslationConfig, TranslationError
+from .translator import OpenRouterTranslator, TranslationConfig, TranslationError, TranslatorPool
 from .auth_middleware import (
     build_logout_url,
     build_microsoft_login_url,
@@ -30,6 +43,50 @@ from .auth_middleware import (
 
 LOGGER = logging.getLogger(__name__)
 
+UPLOAD_CHUNK_SIZE = 1 << 20
+LANGUAGE_SAMPLE_ELEMENTS = 20
+LANGUAGE_SAMPLE_CHARS = 4096
+_ALLOWED_SUFFIXES = frozenset(f".{extension.lower()}" for extension in settings.allowed_extensions)
+
+# langdetect is probabilistic; a fixed seed keeps auto-detect results stable.
+DetectorFactory.seed = 0
+
+LANGUAGES = [
+    {"code": "auto", "label": "Auto Detect"},
+    {"code": "en", "label": "English"},
+    {"code": "zh", "label": "Chinese"},
+    {"code": "ja", "label": "Japanese"},
+    {"code": "es", "label": "Spanish"},
+    {"code": "fr", "label": "French"},
+    {"code": "de", "label": "German"},
+]
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes ``jsonify`` and request bodies with orjson."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self._dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._dumps_bytes(obj), mimetype=self.mimetype)
+
+    def _dumps_bytes(self, obj) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
 
 @dataclass
 class FileRecord:
@@ -63,25 +120,132 @@ class FileRecord:
 
 
 class FileRegistry:
-    """Registry for uploaded and processed files, backed by disk storage."""
-
-    def __init__(self) -> None:
-        self._records: Dict[str, FileRecord] = {}
+    """Registry for uploaded and processed files, backed by disk storage.
+
+    The metadata JSON written beside each file is the record shared by every
+    worker process: lookups touch its mtime, and :meth:`sweep_expired` scans the
+    upload and output folders to delete files untouched for ``ttl_seconds``, or
+    the least recently touched ones once more than ``max_records`` are stored.
+    Up to ``max_records`` records are also kept in memory so repeat lookups skip
+    the JSON read; dropping one from memory never deletes anything on disk.
+    """
+
+    def __init__(self, max_records: Optional[int] = None, ttl_seconds: Optional[int] = None) -> None:
+        self._records: "OrderedDict[str, FileRecord]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_records = max_records if max_records is not None else settings.max_cached_files
+        self._ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.file_ttl_seconds
+        self._sweeper: Optional[threading.Thread] = None
 
     def add(self, record: FileRecord) -> None:
-        self._records[record.file_id] = record
+        self._remember(record)
         self._save_to_disk(record)
 
     def get(self, file_id: str) -> Optional[FileRecord]:
-        if file_id in self._records:
-            return self._records[file_id]
-        
-        # Try to load from disk
-        record = self._load_from_disk(file_id)
-        if record:
-            self._records[file_id] = record
-            return record
-        return None
+        with self._lock:
+            record = self._records.get(file_id)
+            if record is not None:
+                self._records.move_to_end(file_id)
+
+        if record is None:
+            # Try to load from disk
+            record = self._load_from_disk(file_id)
+            if record is None:
+                return None
+            self._remember(record)
+
+        # Another worker may have swept the file since this record was cached.
+        if not record.path.exists():
+            self._forget(file_id)
+            return None
+        self._touch(record)
+        return record
+
+    def sweep_expired(self) -> None:
+        """Delete stored files that have expired or fall outside the size bound.
+
+        Works from the folders rather than the in-memory records, so files
+        written by other workers or earlier runs are collected too. A file's last
+        access is its metadata mtime; files without metadata (orphans, or uploads
+        still being written) fall back to their own mtime and only expire by TTL.
+        """
+        cutoff = time.time() - self._ttl_seconds
+        live: List[Tuple[float, str, List[Path]]] = []
+        for folder in (settings.upload_folder, settings.output_folder):
+            groups: Dict[str, List[Path]] = {}
+            mtimes: Dict[str, float] = {}
+            meta_mtimes: Dict[str, float] = {}
+            try:
+                entries = list(os.scandir(folder))
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                if entry.name.startswith(".") or not entry.is_file():
+                    continue
+                try:
+                    mtime = entry.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+                path = Path(entry.path)
+                file_id = path.stem
+                groups.setdefault(file_id, []).append(path)
+                mtimes[file_id] = max(mtime, mtimes.get(file_id, mtime))
+                if path.suffix == ".json":
+                    meta_mtimes[file_id] = mtime
+
+            for file_id, paths in groups.items():
+                last_access = meta_mtimes.get(file_id, mtimes[file_id])
+                if last_access < cutoff:
+                    self._delete(file_id, paths)
+                elif file_id in meta_mtimes:
+                    live.append((last_access, file_id, paths))
+
+        live.sort()
+        for _, file_id, paths in live[: max(0, len(live) - self._max_records)]:
+            self._delete(file_id, paths)
+
+    def start_sweeper(self, interval: float = 60.0) -> None:
+        """Run :meth:`sweep_expired` periodically on a daemon thread."""
+        if self._sweeper and self._sweeper.is_alive():
+            return
+
+        def _run() -> None:
+            while True:
+                time.sleep(interval)
+                try:
+                    self.sweep_expired()
+                except Exception:  # pragma: no cover - keep the sweeper alive
+                    LOGGER.exception("File registry sweep failed")
+
+        self._sweeper = threading.Thread(target=_run, name="file-registry-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def _remember(self, record: FileRecord) -> None:
+        with self._lock:
+            self._records[record.file_id] = record
+            self._records.move_to_end(record.file_id)
+            while len(self._records) > self._max_records:
+                self._records.popitem(last=False)
+
+    def _forget(self, file_id: str) -> None:
+        with self._lock:
+            self._records.pop(file_id, None)
+
+    def _touch(self, record: FileRecord) -> None:
+        """Mark ``record`` as used so no worker's sweep expires it."""
+        try:
+            os.utime(record.path.parent / f"{record.file_id}.json")
+        except OSError as exc:
+            LOGGER.warning("Failed to touch metadata for %s: %s", record.file_id, exc)
+
+    def _delete(self, file_id: str, paths: Iterable[Path]) -> None:
+        """Remove a stored file and its metadata from disk."""
+        self._forget(file_id)
+        for path in paths:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as exc:
+                LOGGER.error("Failed to remove %s for %s: %s", path, file_id, exc)
 
     def _save_to_disk(self, record: FileRecord) -> None:
         """Save record metadata to a JSON file alongside the file."""
@@ -124,9 +288,14 @@ def create_app() -> Flask:
     app.config["UPLOAD_FOLDER"] = str(settings.upload_folder)
     app.config["OUTPUT_FOLDER"] = str(settings.output_folder)
     app.config["DEFAULT_MODEL"] = settings.default_model
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
+    translator_pool = app.extensions["translator_pool"] = TranslatorPool()
+    atexit.register(translator_pool.close)
 
     settings.upload_folder.mkdir(parents=True, exist_ok=True)
     settings.output_folder.mkdir(parents=True, exist_ok=True)
+    registry.start_sweeper()
 
     register_routes(app)
     register_error_handlers(app)
@@ -144,7 +313,15 @@ def create_app() -> Flask:
     return app
 
 
+def get_translator(config: TranslationConfig) -> OpenRouterTranslator:
+    """Return the current app's shared translator for ``config``."""
+    return current_app.extensions["translator_pool"].get(config)
+
+
 def register_routes(app: Flask) -> None:
+    upload_folder = Path(app.config["UPLOAD_FOLDER"])
+    output_folder = Path(app.config["OUTPUT_FOLDER"])
+
     def _normalize_redirect_path(value: str | None, default: str = "/") -> str:
         if not value or not isinstance(value, str) or not value.startswith("/") or value.startswith("//"):
             return default
@@ -225,25 +402,76 @@ def register_routes(app: Flask) -> None:
 
     @app.post("/upload")
     @require_auth
-    def upload(user_info):
-        if "file" not in request.files:
+    def upload():
+        """Multipart upload, kept for older clients.
+
+        The body is decoded incrementally instead of through ``request.files`` so
+        the filename is validated before any file data is read, and accepted files
+        go straight to the upload folder without a temporary spool. New clients
+        should POST the raw file body to ``/upload/stream``.
+        """
+        boundary = request.mimetype_params.get("boundary")
+        if request.mimetype != "multipart/form-data" or not boundary:
             abort(400, description="No file part in request")
 
-        file_storage = request.files["file"]
-        if file_storage.filename == "":
+        try:
+            filename, chunks = _read_multipart_file(request.stream, boundary.encode("latin-1"), "file")
+        except ValueError:
+            abort(400, description="Malformed multipart request")
+        if filename is None:
+            abort(400, description="No file part in request")
+
+        if filename == "":
             abort(400, description="No file selected")
 
-        if not _allowed_file(file_storage.filename):
+        if not _allowed_file(filename):
+            abort(400, description="Unsupported file type")
+
+        original_name = secure_filename(filename)
+        file_id, stored_name, upload_path = _new_upload_target(original_name)
+        try:
+            size = _write_chunks(upload_path, chunks)
+        except ValueError:
+            upload_path.unlink(missing_ok=True)
+            abort(400, description="Malformed multipart request")
+        except BaseException:
+            upload_path.unlink(missing_ok=True)
+            raise
+
+        return _register_upload(file_id, original_name, stored_name, upload_path, size)
+
+    @app.post("/upload/stream")
+    @require_auth
+    def upload_stream():
+        """Write the raw request body straight to disk without multipart parsing."""
+        filename = request.args.get("filename", "")
+        if not filename:
+            abort(400, description="filename query parameter is required")
+
+        if not _allowed_file(filename):
             abort(400, description="Unsupported file type")
 
-        file_id = uuid4().hex
-        original_name = secure_filename(file_storage.filename)
+        original_name = secure_filename(filename)
+        file_id, stored_name, upload_path = _new_upload_target(original_name)
+        stream = request.stream
+        try:
+            size = _write_chunks(upload_path, iter(lambda: stream.read(UPLOAD_CHUNK_SIZE), b""))
+        except BaseException:
+            upload_path.unlink(missing_ok=True)
+            raise
+        if size == 0:
+            upload_path.unlink(missing_ok=True)
+            abort(400, description="No file selected")
+
+        return _register_upload(file_id, original_name, stored_name, upload_path, size)
+
+    def _new_upload_target(original_name: str) -> tuple[str, str, Path]:
+        file_id = token_hex(16)
         extension = Path(original_name).suffix.lower() or ".bin"
         stored_name = f"{file_id}{extension}"
-        upload_path = Path(app.config["UPLOAD_FOLDER"]) / stored_name
-        file_storage.save(upload_path)
-        size = upload_path.stat().st_size
+        return file_id, stored_name, upload_folder / stored_name
 
+    def _register_upload(file_id: str, original_name: str, stored_name: str, upload_path: Path, size: int):
         record = FileRecord(
             file_id=file_id,
             original_name=original_name,
@@ -258,8 +486,9 @@ def register_routes(app: Flask) -> None:
 
     @app.post("/translate")
     @require_auth
-    def translate(user_info):
-        payload = request.get_json(silent=True) or request.form
+    def translate():
+        # Only run the parser that matches the body so form posts skip JSON decoding and vice versa.
+        payload = request.get_json(silent=True) if request.is_json else request.form
         file_id = payload.get("file_id") if payload else None
         if not file_id:
             abort(400, description="file_id is required")
@@ -287,9 +516,9 @@ def register_routes(app: Flask) -> None:
 
         try:
             handler = get_document_handler(record.path)
+            elements = handler.extract_text()
         except ValueError as exc:
             abort(400, description=str(exc))
-        elements = handler.extract_text()
 
         if not elements:
             abort(400, description="No translatable text found in document")
@@ -297,7 +526,7 @@ def register_routes(app: Flask) -> None:
         if source_lang in {None, "auto"}:
             source_lang = _detect_language(elements)
 
-        translator = OpenRouterTranslator(
+        translator = get_translator(
             TranslationConfig(
                 api_key=api_key,
                 model=model,
@@ -306,14 +535,16 @@ def register_routes(app: Flask) -> None:
             )
         )
 
+        # Repeated titles, headers and cell labels are common; translate each distinct string once.
+        unique_texts = list(dict.fromkeys(element.text for element in elements))
         try:
-            translated_texts = translator.translate_texts([element.text for element in elements])
+            translated_texts = translator.translate_texts(unique_texts)
         except TranslationError as exc:
             LOGGER.error(
                 "Translation failed. file_id=%s original_name=%s user=%s source_lang=%s target_lang=%s model=%s provider_status=%s detail=%s",
                 file_id,
                 record.original_name,
-                user_info.get("username"),
+                g.user_info.get("username"),
                 source_lang,
                 target_lang,
                 model,
@@ -323,14 +554,15 @@ def register_routes(app: Flask) -> None:
             )
             abort(502, description=str(exc))
 
-        mapping = {element.element_id: translated for element, translated in zip(elements, translated_texts)}
+        translated_by_text = dict(zip(unique_texts, translated_texts))
+        mapping = {element.element_id: translated_by_text.get(element.text) for element in elements}
         original_texts = {element.element_id: element.text for element in elements}
 
-        output_id = uuid4().hex
+        output_id = token_hex(16)
         source_suffix = (Path(record.original_name).suffix or Path(record.path).suffix).lower()
         output_filename = f"{Path(record.original_name).stem}_{target_lang}{source_suffix}"
         stored_name = f"{output_id}{source_suffix}"
-        output_path = Path(app.config["OUTPUT_FOLDER"]) / stored_name
+        output_path = output_folder / stored_name
         try:
             handler.apply_translations(
                 mapping,
@@ -371,18 +603,12 @@ def register_routes(app: Flask) -> None:
         directory = record.path.parent
         return send_from_directory(directory, record.path.name, as_attachment=True, download_name=record.original_name)
 
+    # The language list never changes, so serialize it once.
+    languages_body = app.json.dumps(LANGUAGES)
+
     @app.get("/languages")
     def languages():
-        languages = [
-            {"code": "auto", "label": "Auto Detect"},
-            {"code": "en", "label": "English"},
-            {"code": "zh", "label": "Chinese"},
-            {"code": "ja", "label": "Japanese"},
-            {"code": "es", "label": "Spanish"},
-            {"code": "fr", "label": "French"},
-            {"code": "de", "label": "German"},
-        ]
-        return jsonify(languages)
+        return app.response_class(languages_body, mimetype=app.json.mimetype)
 
     @app.get("/api/user")
     def get_user():
@@ -399,8 +625,60 @@ def register_routes(app: Flask) -> None:
         return jsonify({"authenticated": False}), 401
 
 
+def _read_multipart_file(stream, boundary: bytes, field_name: str) -> Tuple[Optional[str], Iterator[bytes]]:
+    """Decode ``stream`` up to the headers of the ``field_name`` file part.
+
+    Returns the part's filename and an iterator over its body, or ``None`` for the
+    filename when the part is missing. Nothing past the part headers is read until
+    the iterator is consumed, so callers can reject the upload first. Raises
+    ``ValueError`` for malformed bodies.
+    """
+    events = _iter_multipart_events(stream, MultipartDecoder(boundary))
+    for event in events:
+        if isinstance(event, File) and event.name == field_name:
+            return event.filename, _iter_part_data(events)
+    return None, iter(())
+
+
+def _iter_multipart_events(stream, decoder: MultipartDecoder) -> Iterator[Event]:
+    while True:
+        chunk = stream.read(UPLOAD_CHUNK_SIZE)
+        decoder.receive_data(chunk or None)
+        event = decoder.next_event()
+        while not isinstance(event, NeedData):
+            yield event
+            if isinstance(event, Epilogue):
+                return
+            event = decoder.next_event()
+        if not chunk:
+            return
+
+
+def _iter_part_data(events: Iterator[Event]) -> Iterator[bytes]:
+    for event in events:
+        if not isinstance(event, Data):
+            return
+        yield event.data
+        if not event.more_data:
+            return
+
+
+def _write_chunks(path: Path, chunks: Iterable[bytes]) -> int:
+    """Write ``chunks`` to ``path`` unbuffered and return the number of bytes written."""
+    total = 0
+    with open(path, "wb", buffering=0) as handle:
+        for chunk in chunks:
+            view = memoryview(chunk)
+            while view:
+                # Raw file writes may be short; keep going until the chunk is on disk.
+                written = handle.write(view)
+                total += written
+                view = view[written:]
+    return total
+
+
 def _allowed_file(filename: str) -> bool:
-    return "." in filename and filename.rsplit(".", 1)[1].lower() in settings.allowed_extensions
+    return Path(filename).suffix.lower() in _ALLOWED_SUFFIXES
 
 
 def register_error_handlers(app: Flask) -> None:
@@ -449,14 +727,15 @@ def _should_return_json_error() -> bool:
 
 
 def _detect_language(elements: Iterable[TextElement]) -> Optional[str]:
-    for element in elements:
-        try:
-            detection = detect(element.text)
-            if detection:
-                return detection
-        except LangDetectException:
-            continue
-    return None
+    """Detect the source language from one sample built from the first elements."""
+    texts = (element.text for element in elements if element.text)
+    sample = " ".join(itertools.islice(texts, LANGUAGE_SAMPLE_ELEMENTS))[:LANGUAGE_SAMPLE_CHARS]
+    if not sample:
+        return None
+    try:
+        return detect(sample) or None
+    except LangDetectException:
+        return None
 
 
 if __name__ == "__main__":
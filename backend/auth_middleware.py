@@ -7,7 +7,7 @@ import json
 from typing import Optional, Dict, Any
 from urllib.parse import urlencode
 
-from flask import request, jsonify, session
+from flask import g, request, jsonify, session
 
 from .config import settings
 
@@ -92,11 +92,13 @@ def establish_local_session(auth_session: Dict[str, Any]) -> Dict[str, Any]:
     session["display_name"] = user_info["display_name"]
     session["email"] = user_info["email"]
     session["auth_method"] = user_info["auth_method"]
+    g.user_info = user_info
     return user_info
 
 
 def clear_local_session() -> None:
     session.clear()
+    g.pop("user_info", None)
 
 
 def get_shared_auth_session() -> Optional[Dict[str, Any]]:
@@ -115,9 +117,17 @@ def build_logout_url(return_path: str = "/login") -> str:
 
 
 def check_session() -> Optional[Dict[str, Any]]:
-    """Check local session first, then fall back to the shared THIS Nexus cookie."""
+    """Check local session first, then fall back to the shared THIS Nexus cookie.
+
+    The result is cached on ``g`` so repeated checks within one request skip the
+    session and cookie lookups.
+    """
+    user_info = g.get("user_info")
+    if user_info:
+        return user_info
+
     if session.get("authenticated") and session.get("user_id"):
-        return {
+        g.user_info = {
             "id": session.get("user_id"),
             "username": session.get("username"),
             "display_name": session.get("display_name") or session.get("username"),
@@ -125,6 +135,7 @@ def check_session() -> Optional[Dict[str, Any]]:
             "authenticated": True,
             "auth_method": session.get("auth_method") or "microsoft",
         }
+        return g.user_info
 
     shared_session = get_shared_auth_session()
     if not shared_session or not is_teacher_auth_session(shared_session):
@@ -137,18 +148,18 @@ def check_session() -> Optional[Dict[str, Any]]:
 
 
 def require_auth(f):
-    """Decorator to require a valid teacher auth session."""
+    """Decorator to require a valid teacher auth session.
+
+    The authenticated user is available to the view as ``g.user_info``.
+    """
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        user_info = check_session()
-
-        if not user_info:
+        if not check_session():
             return jsonify({
                 "error": "Unauthorized",
                 "redirect": "/login"
             }), 401
 
-        kwargs['user_info'] = user_info
         return f(*args, **kwargs)
 
     return decorated_function
@@ -54,6 +54,8 @@ class Settings:
     output_folder: Path = field(default_factory=lambda: RUNTIME_DIR / "output")
     static_folder: Path = field(default_factory=lambda: RESOURCE_DIR / "frontend")
     max_content_length: int = int(os.getenv("MAX_UPLOAD_SIZE", 50 * 1024 * 1024))
+    max_cached_files: int = int(os.getenv("MAX_CACHED_FILES", 256))
+    file_ttl_seconds: int = int(os.getenv("FILE_TTL_SECONDS", 24 * 60 * 60))
     allowed_extensions: Set[str] = field(
         default_factory=lambda: _parse_list(os.getenv("ALLOWED_EXTENSIONS", ""), DEFAULT_EXTENSIONS) | DEFAULT_EXTENSIONS
     )
@@ -1,25 +1,62 @@
 """Shared handlers for extracting and replacing text in supported documents."""
 from __future__ import annotations
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
 
 from docx import Document
+from docx.document import Document as DocxDocument
 from docx.table import _Cell as DocxCell
 from docx.text.paragraph import Paragraph
 from openpyxl import load_workbook
 from pptx import Presentation
 from pptx.enum.text import PP_ALIGN
+from pptx.presentation import Presentation as PptxPresentation
 from pptx.shapes.base import BaseShape
 from pptx.table import _Cell as PptxCell
 from pptx.text.text import _Paragraph
 from pptx.util import Pt
 
+# Below this many slides/tables/sheets a thread pool costs more than it saves.
+PARALLEL_EXTRACT_MIN_ITEMS = 16
+
+# Element ids are packed ints: a 4-bit kind tag in the top bits and the
+# element's coordinates below it in 15-bit fields, so translation lookups hash
+# a small int instead of formatting and hashing a string.
+PPT_PARA, PPT_CELL, DOC_PARA, DOC_CELL, XLS_CELL = range(5)
+ELEMENT_KIND_SHIFT = 60
+_FIELD_BITS = 15
+# Spreadsheet rows go up to 1,048,576, so XLS ids use a 21-bit row field.
+_XLS_ROW_SHIFT = _FIELD_BITS
+_XLS_SHEET_SHIFT = _XLS_ROW_SHIFT + 21
+_FIELD_MASK = (1 << _FIELD_BITS) - 1
+_XLS_ROW_MASK = (1 << (_XLS_SHEET_SHIFT - _XLS_ROW_SHIFT)) - 1
+_XLS_SHEET_MASK = (1 << (ELEMENT_KIND_SHIFT - _XLS_SHEET_SHIFT)) - 1
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+def _pack_element_id(kind: int, a: int = 0, b: int = 0, c: int = 0, d: int = 0) -> int:
+    # An oversized coordinate would spill into its neighbour and alias another element.
+    if (a | b | c | d) > _FIELD_MASK:
+        raise ValueError(f"Document structure exceeds {_FIELD_MASK + 1} items at one level")
+    return (
+        kind << ELEMENT_KIND_SHIFT
+        | a << (3 * _FIELD_BITS)
+        | b << (2 * _FIELD_BITS)
+        | c << _FIELD_BITS
+        | d
+    )
+
 
 @dataclass
 class TextElement:
-    element_id: str
+    element_id: int
     text: str
 
 
@@ -42,6 +79,16 @@ def _get_run_font_attributes(runs) -> tuple[Optional[str], Optional[Any]]:
     return None, None
 
 
+def _ordered_map(func: Callable[[_T], _R], items: Iterable[_T]) -> List[_R]:
+    """Map ``func`` over ``items`` in order, fanning out to threads for large inputs."""
+    items = list(items)
+    workers = min(len(items), os.cpu_count() or 1)
+    if len(items) < PARALLEL_EXTRACT_MIN_ITEMS or workers < 2:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, items))
+
+
 class DocumentHandler:
     """Base protocol for document handlers."""
 
@@ -50,11 +97,11 @@ class DocumentHandler:
 
     def apply_translations(
         self,
-        translations: Dict[str, str],
+        translations: Dict[int, str],
         output_path: Path,
         font_name: Optional[str] = None,
         options: Optional[TranslationOptions] = None,
-        original_texts: Optional[Dict[str, str]] = None,
+        original_texts: Optional[Dict[int, str]] = None,
     ) -> Path:  # pragma: no cover - protocol
         raise NotImplementedError
 
@@ -67,48 +114,72 @@ class PowerPointHandler(DocumentHandler):
 
     def __init__(self, presentation_path: Path):
         self.presentation_path = Path(presentation_path)
+        # Parsed deck and writers from the last extract_text, reused by apply_translations.
+        self._presentation: Optional[PptxPresentation] = None
+        self._element_index: Optional[Dict[int, Callable[..., None]]] = None
 
     def extract_text(self) -> List[TextElement]:
         presentation = Presentation(self.presentation_path)
         elements: List[TextElement] = []
+        element_index: Dict[int, Callable[..., None]] = {}
 
-        for slide_index, slide in enumerate(presentation.slides):
-            for shape_index, shape in enumerate(slide.shapes):
-                elements.extend(self._extract_from_shape(slide_index, shape_index, shape))
+        # Slides are read independently; only apply mutates the deck, so it stays serial.
+        for slide_elements, slide_lookup in _ordered_map(
+            lambda item: self._extract_slide(*item), enumerate(presentation.slides)
+        ):
+            elements.extend(slide_elements)
+            element_index.update(slide_lookup)
 
+        self._presentation = presentation
+        self._element_index = element_index
         return elements
 
     def apply_translations(
         self,
-        translations: Dict[str, str],
+        translations: Dict[int, str],
         output_path: Path,
         font_name: Optional[str] = None,
         options: Optional[TranslationOptions] = None,
-        original_texts: Optional[Dict[str, str]] = None,
+        original_texts: Optional[Dict[int, str]] = None,
     ) -> Path:
-        presentation = Presentation(self.presentation_path)
+        if self._element_index is None:
+            self.extract_text()
+        presentation = self._presentation
+        element_index = self._element_index
         original_texts = original_texts or {}
         options = options or TranslationOptions()
 
-        for slide_index, slide in enumerate(presentation.slides):
-            for shape_index, shape in enumerate(slide.shapes):
-                self._apply_to_shape(
-                    slide_index,
-                    shape_index,
-                    shape,
-                    translations,
-                    options.side_by_side,
-                    original_texts,
-                )
+        # Write straight into the paragraphs/cells recorded during extraction
+        # instead of re-parsing the deck and walking every shape again.
+        for element_id, translated in translations.items():
+            writer = element_index.get(element_id)
+            if writer is not None and translated is not None:
+                writer(translated, options.side_by_side, original_texts.get(element_id))
 
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         presentation.save(output_path)
+        # The cached deck now holds translated text; force a fresh parse next time.
+        self._presentation = None
+        self._element_index = None
         return output_path
 
     # PowerPoint helpers --------------------------------------------------
+    def _extract_slide(
+        self, slide_index: int, slide
+    ) -> Tuple[List[TextElement], Dict[int, Callable[..., None]]]:
+        elements: List[TextElement] = []
+        element_index: Dict[int, Callable[..., None]] = {}
+        for shape_index, shape in enumerate(slide.shapes):
+            elements.extend(self._extract_from_shape(slide_index, shape_index, shape, element_index))
+        return elements, element_index
+
     def _extract_from_shape(
-        self, slide_index: int, shape_index: int, shape: BaseShape
+        self,
+        slide_index: int,
+        shape_index: int,
+        shape: BaseShape,
+        element_index: Dict[int, Callable[..., None]],
     ) -> List[TextElement]:
         elements: List[TextElement] = []
 
@@ -119,6 +190,7 @@ class PowerPointHandler(DocumentHandler):
                 if text:
                     element_id = self._paragraph_id(slide_index, shape_index, paragraph_index)
                     elements.append(TextElement(element_id=element_id, text=text))
+                    element_index[element_id] = partial(self._write_ppt_paragraph, paragraph)
 
         if getattr(shape, "has_table", False):
             table = shape.table
@@ -128,45 +200,41 @@ class PowerPointHandler(DocumentHandler):
                     if text:
                         element_id = self._cell_id(slide_index, shape_index, row_idx, col_idx)
                         elements.append(TextElement(element_id=element_id, text=text))
+                        element_index[element_id] = partial(self._write_ppt_cell, cell)
 
         return elements
 
-    def _apply_to_shape(
-        self,
-        slide_index: int,
-        shape_index: int,
-        shape: BaseShape,
-        translations: Dict[str, str],
+    @classmethod
+    def _write_ppt_paragraph(
+        cls,
+        paragraph: _Paragraph,
+        translated: str,
         side_by_side: bool = False,
-        original_texts: Optional[Dict[str, str]] = None,
+        original_text: Optional[str] = None,
     ) -> None:
-        original_texts = original_texts or {}
-        if getattr(shape, "has_text_frame", False):
-            text_frame = shape.text_frame
-            for paragraph_index, paragraph in enumerate(text_frame.paragraphs):
-                element_id = self._paragraph_id(slide_index, shape_index, paragraph_index)
-                translated = translations.get(element_id)
-                if translated is not None:
-                    original_text = original_texts.get(element_id, paragraph.text.strip())
-                    if side_by_side:
-                        formatted_text = self._format_side_by_side(original_text, translated)
-                        self._replace_ppt_paragraph(paragraph, formatted_text, font_size_pt=16)
-                    else:
-                        self._replace_ppt_paragraph(paragraph, translated)
+        if side_by_side:
+            if original_text is None:
+                original_text = paragraph.text.strip()
+            formatted_text = cls._format_side_by_side(original_text, translated)
+            cls._replace_ppt_paragraph(paragraph, formatted_text, font_size_pt=16)
+        else:
+            cls._replace_ppt_paragraph(paragraph, translated)
 
-        if getattr(shape, "has_table", False):
-            table = shape.table
-            for row_idx, row in enumerate(table.rows):
-                for col_idx, cell in enumerate(row.cells):
-                    element_id = self._cell_id(slide_index, shape_index, row_idx, col_idx)
-                    translated = translations.get(element_id)
-                    if translated is not None:
-                        original_text = original_texts.get(element_id, cell.text.strip())
-                        if side_by_side:
-                            formatted_text = self._format_side_by_side(original_text, translated)
-                            self._replace_ppt_cell(cell, formatted_text, font_size_pt=16)
-                        else:
-                            self._replace_ppt_cell(cell, translated)
+    @classmethod
+    def _write_ppt_cell(
+        cls,
+        cell: PptxCell,
+        translated: str,
+        side_by_side: bool = False,
+        original_text: Optional[str] = None,
+    ) -> None:
+        if side_by_side:
+            if original_text is None:
+                original_text = cell.text.strip()
+            formatted_text = cls._format_side_by_side(original_text, translated)
+            cls._replace_ppt_cell(cell, formatted_text, font_size_pt=16)
+        else:
+            cls._replace_ppt_cell(cell, translated)
 
     @classmethod
     def _replace_ppt_paragraph(cls, paragraph: _Paragraph, new_text: str, font_size_pt: Optional[int] = None) -> None:
@@ -186,12 +254,12 @@ class PowerPointHandler(DocumentHandler):
         cls._apply_body_text_format(paragraph, run, font_size_pt=font_size_pt)
 
     @staticmethod
-    def _paragraph_id(slide_index: int, shape_index: int, paragraph_index: int) -> str:
-        return f"ppt_s{slide_index}_sh{shape_index}_p{paragraph_index}"
+    def _paragraph_id(slide_index: int, shape_index: int, paragraph_index: int) -> int:
+        return _pack_element_id(PPT_PARA, slide_index, shape_index, paragraph_index)
 
     @staticmethod
-    def _cell_id(slide_index: int, shape_index: int, row_index: int, col_index: int) -> str:
-        return f"ppt_s{slide_index}_sh{shape_index}_c{row_index}_{col_index}"
+    def _cell_id(slide_index: int, shape_index: int, row_index: int, col_index: int) -> int:
+        return _pack_element_id(PPT_CELL, slide_index, shape_index, row_index, col_index)
 
     @staticmethod
     def _format_side_by_side(original: str, translated: str) -> str:
@@ -211,56 +279,71 @@ class WordHandler(DocumentHandler):
 
     def __init__(self, document_path: Path):
         self.document_path = Path(document_path)
+        # Parsed document and writers from the last extract_text, reused by apply_translations.
+        self._document: Optional[DocxDocument] = None
+        self._element_index: Optional[Dict[int, Callable[..., None]]] = None
 
     def extract_text(self) -> List[TextElement]:
         document = Document(self.document_path)
         elements: List[TextElement] = []
+        element_index: Dict[int, Callable[..., None]] = {}
 
         for paragraph_index, paragraph in enumerate(document.paragraphs):
             text = paragraph.text.strip()
             if text:
-                elements.append(TextElement(self._paragraph_id(paragraph_index), text))
-
-        for table_index, table in enumerate(document.tables):
-            for row_index, row in enumerate(table.rows):
-                for col_index, cell in enumerate(row.cells):
-                    text = cell.text.strip()
-                    if text:
-                        elements.append(
-                            TextElement(self._cell_id(table_index, row_index, col_index), text)
-                        )
-
+                element_id = self._paragraph_id(paragraph_index)
+                elements.append(TextElement(element_id, text))
+                element_index[element_id] = partial(self._replace_paragraph, paragraph)
+
+        for table_elements, table_lookup in _ordered_map(
+            lambda item: self._extract_table(*item), enumerate(document.tables)
+        ):
+            elements.extend(table_elements)
+            element_index.update(table_lookup)
+
+        self._document = document
+        self._element_index = element_index
         return elements
 
     def apply_translations(
         self,
-        translations: Dict[str, str],
+        translations: Dict[int, str],
         output_path: Path,
         font_name: Optional[str] = None,
         options: Optional[TranslationOptions] = None,
-        original_texts: Optional[Dict[str, str]] = None,
+        original_texts: Optional[Dict[int, str]] = None,
     ) -> Path:
-        document = Document(self.document_path)
+        if self._element_index is None:
+            self.extract_text()
+        document = self._document
+        element_index = self._element_index
 
-        for paragraph_index, paragraph in enumerate(document.paragraphs):
-            element_id = self._paragraph_id(paragraph_index)
-            translated = translations.get(element_id)
-            if translated is not None:
-                self._replace_paragraph(paragraph, translated, font_name)
-
-        for table_index, table in enumerate(document.tables):
-            for row_index, row in enumerate(table.rows):
-                for col_index, cell in enumerate(row.cells):
-                    element_id = self._cell_id(table_index, row_index, col_index)
-                    translated = translations.get(element_id)
-                    if translated is not None:
-                        self._replace_cell(cell, translated, font_name)
+        for element_id, translated in translations.items():
+            writer = element_index.get(element_id)
+            if writer is not None and translated is not None:
+                writer(translated, font_name)
 
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         document.save(output_path)
+        self._document = None
+        self._element_index = None
         return output_path
 
+    def _extract_table(
+        self, table_index: int, table
+    ) -> Tuple[List[TextElement], Dict[int, Callable[..., None]]]:
+        elements: List[TextElement] = []
+        element_index: Dict[int, Callable[..., None]] = {}
+        for row_index, row in enumerate(table.rows):
+            for col_index, cell in enumerate(row.cells):
+                text = cell.text.strip()
+                if text:
+                    element_id = self._cell_id(table_index, row_index, col_index)
+                    elements.append(TextElement(element_id, text))
+                    element_index[element_id] = partial(self._replace_cell, cell)
+        return elements, element_index
+
     @staticmethod
     def _replace_paragraph(paragraph: Paragraph, new_text: str, font_name: Optional[str]) -> None:
         original_name, original_size = _get_run_font_attributes(paragraph.runs)
@@ -309,12 +392,13 @@ class WordHandler(DocumentHandler):
             run.font.size = original_size
 
     @staticmethod
-    def _paragraph_id(paragraph_index: int) -> str:
-        return f"doc_p{paragraph_index}"
+    def _paragraph_id(paragraph_index: int) -> int:
+        # Long documents can exceed a 15-bit field; use everything below the tag.
+        return DOC_PARA << ELEMENT_KIND_SHIFT | paragraph_index
 
     @staticmethod
-    def _cell_id(table_index: int, row_index: int, col_index: int) -> str:
-        return f"doc_t{table_index}_r{row_index}_c{col_index}"
+    def _cell_id(table_index: int, row_index: int, col_index: int) -> int:
+        return _pack_element_id(DOC_CELL, table_index, row_index, col_index)
 
 
 class ExcelHandler(DocumentHandler):
@@ -324,36 +408,51 @@ class ExcelHandler(DocumentHandler):
         self.workbook_path = Path(workbook_path)
 
     def extract_text(self) -> List[TextElement]:
-        workbook = load_workbook(self.workbook_path, data_only=True)
+        # Read-only mode streams the sheet XML instead of building every Cell and style.
+        workbook = load_workbook(self.workbook_path, data_only=True, read_only=True)
         elements: List[TextElement] = []
 
-        for sheet_index, sheet in enumerate(workbook.worksheets):
-            for row in sheet.iter_rows():
-                for cell in row:
-                    value = cell.value
-                    if isinstance(value, str):
-                        text = value.strip()
-                        if text:
-                            elements.append(
-                                TextElement(self._cell_id(sheet_index, cell.row, cell.column), text)
-                            )
+        try:
+            for sheet_elements in _ordered_map(
+                lambda item: self._extract_sheet(*item), enumerate(workbook.worksheets)
+            ):
+                elements.extend(sheet_elements)
+        finally:
+            workbook.close()
+
+        return elements
+
+    def _extract_sheet(self, sheet_index: int, sheet) -> List[TextElement]:
+        elements: List[TextElement] = []
+        # The stored dimensions can be stale; without them the parser reads every row.
+        sheet.reset_dimensions()
+        for row_index, values in enumerate(sheet.iter_rows(values_only=True), start=1):
+            for column_index, value in enumerate(values, start=1):
+                if isinstance(value, str):
+                    text = value.strip()
+                    if text:
+                        element_id = self._cell_id(sheet_index, row_index, column_index)
+                        elements.append(TextElement(element_id, text))
         return elements
 
     def apply_translations(
         self,
-        translations: Dict[str, str],
+        translations: Dict[int, str],
         output_path: Path,
         font_name: Optional[str] = None,
         options: Optional[TranslationOptions] = None,
-        original_texts: Optional[Dict[str, str]] = None,
+        original_texts: Optional[Dict[int, str]] = None,
     ) -> Path:
         options = options or TranslationOptions()
+        # Extraction reads cached values (data_only), so the workbook is loaded
+        # again here to keep formulas intact; only the translated cells are visited.
         workbook = load_workbook(self.workbook_path)
         original_sheets = list(workbook.worksheets)
+        translations_by_sheet = self._group_by_sheet(translations)
 
         if options.spreadsheet_mode == "in_place":
             for sheet_index, sheet in enumerate(original_sheets):
-                self._apply_to_sheet(sheet_index, sheet, translations, font_name=font_name)
+                self._apply_to_sheet(sheet, translations_by_sheet.get(sheet_index), font_name=font_name)
         elif options.spreadsheet_mode == "new_sheet":
             for sheet_index, sheet in enumerate(original_sheets):
                 translated_sheet = workbook.copy_worksheet(sheet)
@@ -361,7 +460,7 @@ class ExcelHandler(DocumentHandler):
                 workbook._sheets.remove(translated_sheet)
                 original_position = workbook._sheets.index(sheet)
                 workbook._sheets.insert(original_position + 1, translated_sheet)
-                self._apply_to_sheet(sheet_index, translated_sheet, translations, font_name=font_name)
+                self._apply_to_sheet(translated_sheet, translations_by_sheet.get(sheet_index), font_name=font_name)
         else:
             raise ValueError(f"Unsupported spreadsheet mode: {options.spreadsheet_mode}")
 
@@ -370,21 +469,30 @@ class ExcelHandler(DocumentHandler):
         workbook.save(output_path)
         return output_path
 
+    @staticmethod
+    def _group_by_sheet(translations: Dict[int, str]) -> Dict[int, List[Tuple[int, int, str]]]:
+        """Decode each translation key into ``sheet -> [(row, column, text)]``."""
+        grouped: Dict[int, List[Tuple[int, int, str]]] = {}
+        for element_id, translated in translations.items():
+            if element_id >> ELEMENT_KIND_SHIFT != XLS_CELL or translated is None:
+                continue
+            sheet_index = element_id >> _XLS_SHEET_SHIFT & _XLS_SHEET_MASK
+            row_index = element_id >> _XLS_ROW_SHIFT & _XLS_ROW_MASK
+            column_index = element_id & _FIELD_MASK
+            grouped.setdefault(sheet_index, []).append((row_index, column_index, translated))
+        return grouped
+
+    @staticmethod
     def _apply_to_sheet(
-        self,
-        sheet_index: int,
         sheet,
-        translations: Dict[str, str],
+        cells: Optional[List[Tuple[int, int, str]]],
         font_name: Optional[str] = None,
     ) -> None:
-        for row in sheet.iter_rows():
-            for cell in row:
-                element_id = self._cell_id(sheet_index, cell.row, cell.column)
-                translated = translations.get(element_id)
-                if translated is not None:
-                    cell.value = translated
-                    if font_name:
-                        cell.font = cell.font.copy(name=font_name)
+        for row_index, column_index, translated in cells or ():
+            cell = sheet.cell(row=row_index, column=column_index)
+            cell.value = translated
+            if font_name:
+                cell.font = cell.font.copy(name=font_name)
 
     @staticmethod
     def _translated_sheet_title(base_title: str, existing_titles: List[str]) -> str:
@@ -404,8 +512,13 @@ class ExcelHandler(DocumentHandler):
             index += 1
 
     @staticmethod
-    def _cell_id(sheet_index: int, row_index: int, column_index: int) -> str:
-        return f"xls_s{sheet_index}_r{row_index}_c{column_index}"
+    def _cell_id(sheet_index: int, row_index: int, column_index: int) -> int:
+        return (
+            XLS_CELL << ELEMENT_KIND_SHIFT
+            | sheet_index << _XLS_SHEET_SHIFT
+            | row_index << _XLS_ROW_SHIFT
+            | column_index
+        )
 
 
 def get_document_handler(path: Path) -> DocumentHandler:
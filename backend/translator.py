@@ -1,18 +1,63 @@
 """Translation helpers for communicating with the OpenRouter API."""
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:  # Optional speedup; the stdlib json module is used without it.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
 
 from .config import settings
 
 LOGGER = logging.getLogger(__name__)
 
+# Characters that attach to the previous segment, and endings that close a sentence,
+# used when merging over-split translation items.
+_LEADING_PUNCT = frozenset(",.;:!?)]}")
+_SENTENCE_ENDERS = (".", "!", "?", "。", "！", "？")
+
+_FENCED_JSON_RE = re.compile(r"```(?:json)?\s*(\[[\s\S]*?\])\s*```")
+
+# Per-translator LRU of provider translations, and how many translators an app keeps alive.
+TRANSLATION_CACHE_SIZE = 10_000
+TRANSLATOR_POOL_SIZE = 32
+# Request threads that may share one pooled translator; matches gunicorn's gthread count.
+TRANSLATOR_SHARED_REQUESTS = 8
+
+
+def _json_dumps(value) -> str:
+    """Serialize to a JSON string, keeping non-ASCII text unescaped."""
+    if orjson is not None:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _json_encode(value) -> bytes:
+    """Serialize to UTF-8 JSON bytes for a request body."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
+def _json_loads(value):
+    """Parse JSON text or bytes; raises ``json.JSONDecodeError`` on bad input."""
+    if orjson is not None:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError.
+        return orjson.loads(value)
+    return json.loads(value)
+
 
 class TranslationError(RuntimeError):
     """Raised when the translation provider fails."""
@@ -36,17 +81,47 @@ class TranslationConfig:
     source_lang: Optional[str]
     target_lang: str
     temperature: float = 0.0
+    max_concurrency: int = 4
 
 
 class OpenRouterTranslator:
-    """Wrapper around the OpenRouter chat completion endpoint."""
+    """Wrapper around the OpenRouter chat completion endpoint.
+
+    Instances are safe to share between threads; see :class:`TranslatorPool`.
+    """
 
     MAX_BATCH_ITEMS = 40
     MAX_BATCH_CHARS = 12000
+    # Far above any honest reply to a MAX_BATCH_CHARS batch; caps memory on runaway output.
+    MAX_RESPONSE_BYTES = 8 * 1024 * 1024
+    RESPONSE_CHUNK_BYTES = 64 * 1024
 
     def __init__(self, config: TranslationConfig):
         self.config = config
         self.api_base = settings.openrouter_api_base.rstrip("/")
+        # Shared by concurrent batches so they reuse keep-alive connections.
+        self._session = requests.Session()
+        self._session.headers.update(
+            {
+                "Authorization": f"Bearer {config.api_key}",
+                "Content-Type": "application/json",
+            }
+        )
+        # Each sharing request may run max_concurrency batches at once; size the pool
+        # for all of them so urllib3 does not discard connections it cannot keep.
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=max(1, config.max_concurrency) * TRANSLATOR_SHARED_REQUESTS,
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        # Keyed by stripped source text; the config fixes languages and model.
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Release pooled HTTP connections."""
+        self._session.close()
 
     def translate_texts(self, texts: Iterable[str]) -> List[str]:
         texts = list(texts)
@@ -55,30 +130,86 @@ class OpenRouterTranslator:
 
         if not self.config.api_key:
             LOGGER.warning("No OpenRouter API key provided; falling back to mock translation.")
-            return [self._mock_translate(text) for text in texts]
-
-        translations: List[str] = []
-        for batch_index, batch in enumerate(self._chunk_texts(texts), start=1):
-            LOGGER.info(
-                "Submitting translation batch %s with %s segments and %s characters",
-                batch_index,
-                len(batch),
-                sum(len(item) for item in batch),
-            )
-            translations.extend(self._translate_batch(batch))
+            prefix = self._mock_prefix()
+            return [prefix + text for text in texts]
+
+        translations = self._lookup_cached(texts)
+        missing = [idx for idx, cached in enumerate(translations) if cached is None]
+        if len(missing) < len(texts):
+            LOGGER.info("Translation cache hits: %s of %s segments", len(texts) - len(missing), len(texts))
+        if not missing:
+            return translations
 
+        # Send each distinct missing string once and fan the result back out.
+        first_seen: Dict[str, int] = {}
+        unique: List[str] = []
+        index_map: List[int] = []
+        for idx in missing:
+            text = texts[idx]
+            position = first_seen.get(text)
+            if position is None:
+                position = first_seen[text] = len(unique)
+                unique.append(text)
+            index_map.append(position)
+
+        fresh = [translated for batch in self._run_batches(self._chunk_texts(unique)) for translated in batch]
+
+        for idx, position in zip(missing, index_map):
+            translations[idx] = fresh[position]
         return translations
 
+    def _run_batches(self, batches: List[List[str]]) -> List[List[str]]:
+        """Translate ``batches`` concurrently, returning results in submission order."""
+        numbered = list(enumerate(batches, start=1))
+        workers = min(max(1, self.config.max_concurrency), len(batches))
+        if workers == 1:
+            return [self._submit_batch(item) for item in numbered]
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            return list(executor.map(self._submit_batch, numbered))
+        finally:
+            # On failure, drop queued batches rather than spending more API calls.
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit_batch(self, item: Tuple[int, List[str]]) -> List[str]:
+        batch_index, batch = item
+        LOGGER.info(
+            "Submitting translation batch %s with %s segments and %s characters",
+            batch_index,
+            len(batch),
+            sum(len(text) for text in batch),
+        )
+        return self._translate_batch(batch)
+
+    def _lookup_cached(self, texts: List[str]) -> List[Optional[str]]:
+        keys = [text.strip() for text in texts]
+        results: List[Optional[str]] = []
+        with self._cache_lock:
+            for key in keys:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                results.append(cached)
+        return results
+
+    def _store_cached(self, texts: List[str], translations: List[str]) -> None:
+        keys = [text.strip() for text in texts]
+        with self._cache_lock:
+            for key, translated in zip(keys, translations):
+                self._cache[key] = translated
+                self._cache.move_to_end(key)
+            while len(self._cache) > TRANSLATION_CACHE_SIZE:
+                self._cache.popitem(last=False)
+
     def _translate_batch(self, texts: List[str]) -> List[str]:
-        payload = self._build_request_payload(texts)
-        headers = {
-            "Authorization": f"Bearer {self.config.api_key}",
-            "Content-Type": "application/json",
-        }
+        # Pre-encode the body so requests does not re-serialize it with the stdlib encoder.
+        body = _json_encode(self._build_request_payload(texts))
 
         endpoint = f"{self.api_base}/chat/completions"
         try:
-            response = requests.post(endpoint, json=payload, headers=headers, timeout=300)
+            with self._session.post(endpoint, data=body, timeout=300, stream=True) as response:
+                content = self._read_response_body(response)
         except requests.RequestException as exc:  # pragma: no cover - network failure
             LOGGER.exception(
                 "Failed to contact OpenRouter API. endpoint=%s model=%s",
@@ -88,7 +219,7 @@ class OpenRouterTranslator:
             raise TranslationError("Failed to contact OpenRouter API") from exc
 
         if response.status_code >= 400:
-            error_preview = response.text[:500] if len(response.text) > 500 else response.text
+            error_preview = self._preview(response, content, 500)
             LOGGER.error(
                 "OpenRouter API returned an error. endpoint=%s model=%s status=%s response=%s",
                 endpoint,
@@ -102,7 +233,7 @@ class OpenRouterTranslator:
                 response_preview=error_preview,
             )
 
-        data = self._decode_response_json(response)
+        data = self._decode_response_json(response, content)
         try:
             message_content = self._extract_message_content(data)
         except (KeyError, IndexError) as exc:
@@ -116,12 +247,17 @@ class OpenRouterTranslator:
             ) from exc
 
         translations = self._extract_translations(message_content, len(texts))
-        if len(translations) != len(texts):
+        reconciled = len(translations) != len(texts)
+        if reconciled:
             translations = self._reconcile_translation_count(translations, texts)
         if len(translations) != len(texts):
             raise TranslationError("Translation count mismatch between request and response")
 
-        return [str(item) for item in translations]
+        translations = [str(item) for item in translations]
+        # Reconciled batches may pair merged or padded items with the wrong source; don't keep them.
+        if not reconciled:
+            self._store_cached(texts, translations)
+        return translations
 
     def _build_request_payload(self, texts: List[str]) -> dict:
         source = self.config.source_lang or "auto-detect"
@@ -137,7 +273,7 @@ class OpenRouterTranslator:
             {"role": "system", "content": "Do not include reasoning, commentary, or code fences. Respond with the JSON array only."},
             {
                 "role": "user",
-                "content": json.dumps(list(texts), ensure_ascii=False),
+                "content": _json_dumps(list(texts)),
             },
         ]
 
@@ -147,9 +283,8 @@ class OpenRouterTranslator:
             "temperature": self.config.temperature,
         }
 
-    def _mock_translate(self, text: str) -> str:
-        target = self.config.target_lang or "translated"
-        return f"[{target}] {text}"
+    def _mock_prefix(self) -> str:
+        return f"[{self.config.target_lang or 'translated'}] "
 
     def _chunk_texts(self, texts: List[str]) -> List[List[str]]:
         batches: List[List[str]] = []
@@ -174,11 +309,43 @@ class OpenRouterTranslator:
 
         return batches
 
-    def _decode_response_json(self, response: requests.Response) -> dict:
+    def _read_response_body(self, response: requests.Response) -> bytes:
+        """Read the streamed body, refusing to buffer more than MAX_RESPONSE_BYTES."""
+        limit = self.MAX_RESPONSE_BYTES
+        declared = response.headers.get("Content-Length")
+        if declared and declared.isdigit() and int(declared) > limit:
+            self._raise_response_too_large(response)
+
+        chunks: List[bytes] = []
+        received = 0
+        for chunk in response.iter_content(chunk_size=self.RESPONSE_CHUNK_BYTES):
+            received += len(chunk)
+            if received > limit:
+                self._raise_response_too_large(response)
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    def _raise_response_too_large(self, response: requests.Response) -> None:
+        LOGGER.error(
+            "OpenRouter response exceeded %s bytes. status=%s model=%s",
+            self.MAX_RESPONSE_BYTES,
+            response.status_code,
+            self.config.model or settings.default_model,
+        )
+        raise TranslationError(
+            "OpenRouter response was too large to process",
+            provider_status=response.status_code,
+        )
+
+    @staticmethod
+    def _preview(response: requests.Response, content: bytes, limit: int) -> str:
+        return content[: limit * 4].decode(response.encoding or "utf-8", errors="replace")[:limit]
+
+    def _decode_response_json(self, response: requests.Response, content: bytes) -> dict:
         try:
-            return response.json()
-        except requests.exceptions.JSONDecodeError as exc:
-            preview = response.text[:1000] if response.text else ""
+            return _json_loads(content)
+        except json.JSONDecodeError as exc:
+            preview = self._preview(response, content, 1000)
             LOGGER.error(
                 "Failed to decode provider JSON response. status=%s preview=%s",
                 response.status_code,
@@ -206,24 +373,27 @@ class OpenRouterTranslator:
         raise KeyError("Unsupported message content format")
 
     def _extract_translations(self, message: str, expected_count: int) -> List[str]:
-        candidates = []
-
-        # 1. Try parsing the whole message as JSON
+        # 1. Well-behaved models return a bare JSON array; only fall back to the
+        # fence/bracket scans when the message does not decode as one.
         try:
-            parsed = json.loads(message)
-            if isinstance(parsed, list):
-                if expected_count == 0 or len(parsed) == expected_count:
-                    return parsed
-                candidates.append(parsed)
+            parsed = _json_loads(message)
         except json.JSONDecodeError:
-            pass
+            return self._extract_translations_fallback(message, expected_count)
+        if not isinstance(parsed, list):
+            return self._extract_translations_fallback(message, expected_count)
+        if expected_count and len(parsed) != expected_count:
+            self._log_count_mismatch(expected_count, len(parsed))
+        return parsed
+
+    def _extract_translations_fallback(self, message: str, expected_count: int) -> List[str]:
+        candidates = []
 
-        # 2. Try parsing fenced code blocks
-        fenced = re.search(r"```(?:json)?\s*(\[[\s\S]*?\])\s*```", message, re.DOTALL)
+        # 2. Try parsing fenced code blocks (skip the regex when there is no fence)
+        fenced = _FENCED_JSON_RE.search(message) if "```" in message else None
         if fenced:
             snippet = fenced.group(1)
             try:
-                parsed = json.loads(snippet)
+                parsed = _json_loads(snippet)
                 if isinstance(parsed, list):
                     if expected_count == 0 or len(parsed) == expected_count:
                         return parsed
@@ -233,9 +403,9 @@ class OpenRouterTranslator:
 
         # 3. Try finding a JSON array in the text
         array_snippet = self._find_json_array(message)
-        if array_snippet:
+        if array_snippet and (not fenced or array_snippet != fenced.group(1)):
             try:
-                parsed = json.loads(array_snippet)
+                parsed = _json_loads(array_snippet)
                 if isinstance(parsed, list):
                     if expected_count == 0 or len(parsed) == expected_count:
                         return parsed
@@ -246,17 +416,21 @@ class OpenRouterTranslator:
         # If we found any candidates (even with mismatched length), return the first one
         # The reconciliation logic will handle the count mismatch
         if candidates:
-            LOGGER.warning(
-                "Translation count mismatch (expected %s, got %s). Will attempt reconciliation.",
-                expected_count,
-                len(candidates[0])
-            )
+            self._log_count_mismatch(expected_count, len(candidates[0]))
             return candidates[0]
 
         # Only raise an error if we couldn't parse any valid JSON array at all
         LOGGER.error("Could not parse any valid JSON array from response. Response preview: %s", message[:500])
         raise TranslationError("Could not parse translation response from OpenRouter")
 
+    @staticmethod
+    def _log_count_mismatch(expected_count: int, received_count: int) -> None:
+        LOGGER.warning(
+            "Translation count mismatch (expected %s, got %s). Will attempt reconciliation.",
+            expected_count,
+            received_count,
+        )
+
     def _reconcile_translation_count(self, translations: List[str], original_texts: List[str]) -> List[str]:
         expected = len(original_texts)
         current = len(translations)
@@ -305,10 +479,10 @@ class OpenRouterTranslator:
             if not segment:
                 return idx - 1
             first_char = segment[0]
-            previous = items[idx - 1]
-            if first_char in ",.;:!?)]}":
+            if first_char in _LEADING_PUNCT:
                 return idx - 1
-            if previous and not previous.rstrip().endswith((".", "!", "?", "。", "！", "？")):
+            previous = items[idx - 1]
+            if previous and not previous.rstrip().endswith(_SENTENCE_ENDERS):
                 return idx - 1
             if first_char.islower():
                 return idx - 1
@@ -322,32 +496,106 @@ class OpenRouterTranslator:
             return right
         if not right:
             return left
-        if right[0] in ",.;:!?)]}":
+        if right[0] in _LEADING_PUNCT:
             return left + right
         return f"{left} {right}"
 
     def _find_json_array(self, message: str) -> Optional[str]:
+        """Return the first balanced ``[...]`` span in ``message``, ignoring brackets in strings.
+
+        Uses ``str.find`` to jump between brackets and quotes so runs of ordinary
+        text are skipped in C rather than inspected one character at a time.
+        """
         start = message.find('[')
         if start == -1:
             return None
         depth = 0
-        in_string = False
-        escape = False
-        for idx in range(start, len(message)):
-            char = message[idx]
-            if char == '"' and not escape:
-                in_string = not in_string
-            if in_string:
-                if char == '\\' and not escape:
-                    escape = True
-                else:
-                    escape = False
-                continue
-            escape = char == '\\' and not escape
-            if char == '[':
+        idx = start
+        next_open = start
+        next_close = message.find(']', start)
+        next_quote = message.find('"', start)
+        while True:
+            if next_open != -1 and next_open < idx:
+                next_open = message.find('[', idx)
+            if next_close != -1 and next_close < idx:
+                next_close = message.find(']', idx)
+            if next_quote != -1 and next_quote < idx:
+                next_quote = message.find('"', idx)
+            if next_close == -1:
+                return None
+
+            idx = min(pos for pos in (next_open, next_close, next_quote) if pos != -1)
+            if idx == next_quote:
+                idx = self._find_string_end(message, idx + 1)
+                if idx == -1:
+                    return None
+            elif idx == next_open:
                 depth += 1
-            elif char == ']':
+            else:
                 depth -= 1
                 if depth == 0:
                     return message[start:idx + 1]
-        return None
+            idx += 1
+
+    @staticmethod
+    def _find_string_end(message: str, idx: int) -> int:
+        """Return the index of the closing quote for a string body starting at ``idx``."""
+        while True:
+            idx = message.find('"', idx)
+            if idx == -1:
+                return -1
+            backslashes = 0
+            while message[idx - 1 - backslashes] == '\\':
+                backslashes += 1
+            if backslashes % 2 == 0:
+                return idx
+            idx += 1
+
+
+class TranslatorPool:
+    """Thread-safe LRU of translators shared across requests.
+
+    Reusing a translator keeps its pooled connections and translation cache warm.
+    Translators are keyed by a hash of the API key plus the rest of the config.
+    """
+
+    def __init__(self, max_size: int = TRANSLATOR_POOL_SIZE):
+        self.max_size = max_size
+        self._translators: "OrderedDict[tuple, OpenRouterTranslator]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(config: TranslationConfig) -> tuple:
+        api_key_hash = hashlib.sha256(config.api_key.encode("utf-8")).hexdigest()
+        return (
+            api_key_hash,
+            config.model or settings.default_model,
+            config.source_lang,
+            config.target_lang,
+            config.temperature,
+            config.max_concurrency,
+        )
+
+    def get(self, config: TranslationConfig) -> OpenRouterTranslator:
+        key = self._key(config)
+        evicted: List[OpenRouterTranslator] = []
+        with self._lock:
+            translator = self._translators.get(key)
+            if translator is not None:
+                self._translators.move_to_end(key)
+                return translator
+            translator = self._translators[key] = OpenRouterTranslator(config)
+            while len(self._translators) > self.max_size:
+                evicted.append(self._translators.popitem(last=False)[1])
+        # Evicted translators may still be serving a request; closing the session only
+        # drops idle pooled connections, and requests reopens one if it is used again.
+        for old in evicted:
+            old.close()
+        return translator
+
+    def close(self) -> None:
+        with self._lock:
+            translators = list(self._translators.values())
+            self._translators.clear()
+        for translator in translators:
+            translator.close()
@@ -289,12 +289,12 @@ async function handleTranslate(event) {
 }
 
 async function uploadFile(file) {
-  const formData = new FormData();
-  formData.append('file', file);
-
-  const response = await fetch('/upload', {
+  const response = await fetch(`/upload/stream?filename=${encodeURIComponent(file.name)}`, {
     method: 'POST',
-    body: formData,
+    headers: {
+      'Content-Type': 'application/octet-stream',
+    },
+    body: file,
     credentials: 'include'
   });
 
@@ -1,6 +1,9 @@
 bind = "127.0.0.1:3001"
+# Requests spend most of their time waiting on OpenRouter, so each worker
+# serves several of them on threads instead of holding one process per call.
+# Keep in sync with run_gunicorn.sh.
 workers = 3
-threads = 4
+threads = 8
 timeout = 120
-worker_class = "sync"
-chdir = "/www/wwwroot/translateppt"
\ No newline at end of file
+worker_class = "gthread"
+chdir = "/www/wwwroot/translateppt"
@@ -11,17 +11,21 @@ from backend.app import create_app
 
 
 def _wait_for_server(host: str, port: int, timeout: float = 15.0) -> bool:
-    """Poll the HTTP port until it is reachable or timeout occurs."""
-    deadline = time.time() + timeout
-    while time.time() < deadline:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-            sock.settimeout(0.5)
-            try:
-                sock.connect((host, port))
-            except OSError:
-                time.sleep(0.3)
-                continue
-            return True
+    """Poll the HTTP port until it is reachable or timeout occurs.
+
+    Polls start 10 ms apart and back off to 250 ms, so the browser opens soon
+    after the server starts listening without spinning while it boots.
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.01
+    while time.monotonic() < deadline:
+        try:
+            # A refused connect leaves a socket unusable, so each probe gets a fresh one.
+            with socket.create_connection((host, port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(delay)
+            delay = min(delay * 1.5, 0.25)
     return False
 
 